@@ -1,13 +1,174 @@
 """
 DB: Handles all SQLite operations for items, revision history, and price tracking.
 """
-import sqlite3
+try:
+    # Optional: pysqlite3-binary bundles a newer, perf-tuned SQLite build
+    # (STAT4, no MEMSTATUS atomics). Fall back to the stdlib module.
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
 import os
 import datetime
+import functools
 import json
+import queue
+import re
+import statistics
+import threading
+import time
+from contextlib import contextmanager
 
 DB_PATH = "provenance.db"
 
+# Hot-path SQL hoisted to module scope: sqlite3's per-connection statement
+# cache is keyed by the SQL string, so reusing the same interned constant
+# guarantees the prepared statement is reused instead of re-parsed.
+_SQL_ADD_ITEM = '''
+    INSERT INTO items (
+        image_path, notes, openai_result, created_at,
+        title, brand, maker, description, condition, provenance_notes,
+        prc_low, prc_med, prc_hi
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_ADD_REVISION = "INSERT INTO revisions (item_id, notes, timestamp) VALUES (?, ?, ?)"
+_SQL_ADD_PRICE = "INSERT INTO prices (item_id, price, timestamp) VALUES (?, ?, ?)"
+_SQL_ADD_CHANGE = "INSERT INTO item_changes (item_id, field, old_value, new_value, timestamp) VALUES (?, ?, ?, ?, ?)"
+_SQL_ADD_IMG_HISTORY = "INSERT INTO image_history (item_id, image_path, action, meta, timestamp) VALUES (?, ?, ?, ?, ?)"
+_SQL_GET_REVISIONS = "SELECT notes, timestamp FROM revisions WHERE item_id=? ORDER BY timestamp DESC"
+_SQL_GET_CHANGES = "SELECT field, old_value, new_value, timestamp FROM item_changes WHERE item_id=? ORDER BY timestamp DESC"
+_SQL_GET_IMG_HISTORY = "SELECT image_path, action, meta, timestamp FROM image_history WHERE item_id=? ORDER BY timestamp DESC"
+
+# RETURNING needs SQLite 3.35+; older runtimes fall back to lastrowid.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_ADD_ITEM_RETURNING = _SQL_ADD_ITEM.rstrip() + ' RETURNING id\n'
+
+# Regexes compiled once at import instead of per line/value in the
+# extraction loops.
+_LABEL_RES = {
+    k: re.compile(rf'^{k}[\s_]*:', re.IGNORECASE)
+    for k in ('title', 'brand', 'maker', 'description', 'condition', 'provenance_notes')
+}
+_PRICE_RE = re.compile(r'\$([0-9,.]+)')
+# Reverse synonym lookup for extract_provenance_fields: response key ->
+# schema field, built once instead of nested-looping synonyms per call.
+_SYNONYM_TO_FIELD = {
+    syn: field
+    for field, syns in {
+        'title': ['title', 'name', 'object_title', 'item_title'],
+        'brand': ['brand', 'brand_name'],
+        'maker': ['maker', 'manufacturer', 'artist', 'creator', 'author'],
+        'description': ['description', 'summary', 'details'],
+        'condition': ['condition', 'condition_notes', 'state'],
+        'provenance_notes': ['provenance_notes', 'provenance', 'history', 'notes_provenance'],
+    }.items()
+    for syn in syns
+}
+# ```json ... ``` fence around a whole response; group 1 is the payload
+_FENCE_RE = re.compile(r'^```[\w-]*[ \t]*\r?\n(.*?)\r?\n?```\s*$', re.DOTALL)
+_NUM_RE = re.compile(r'([0-9][0-9,]*\.?[0-9]*)')
+
+
+def _connect(readonly=False):
+    """Open a connection tuned for this app's desktop workload: WAL keeps
+    readers from blocking writers, synchronous=NORMAL drops the per-commit
+    fsync while staying crash-safe under WAL, and busy_timeout papers over
+    transient lock contention instead of raising immediately. Pass
+    readonly=True for pooled reader handles: SQLite then refuses any write
+    on that handle, so a bug in a read path can't stall the writer."""
+    if readonly:
+        conn = sqlite3.connect('file:%s?mode=ro' % DB_PATH, uri=True,
+                               check_same_thread=False, cached_statements=256)
+        # journal_mode=WAL is persistent and already set by the write
+        # connection; a read-only handle couldn't switch modes anyway.
+        conn.executescript(
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA busy_timeout=30000;"
+            "PRAGMA foreign_keys=ON;"
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA busy_timeout=30000;"
+        "PRAGMA foreign_keys=ON;"
+    )
+    # Name-based access without Python-side dict building; Row still
+    # supports tuple-style indexing and unpacking everywhere else.
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+@functools.lru_cache(maxsize=256)
+def _coerce_json_str(s):
+    """Parse a string that should contain a JSON object; handles raw JSON,
+    prose-embedded {...} blocks and Markdown code fences. Memoized because
+    extract_provenance_fields and extract_prices both coerce the same
+    openai_result back-to-back on every add/update."""
+    stripped = s.strip()
+    # Fast path: no object opener anywhere means nothing below can parse,
+    # so skip straight to the regex fallbacks in the callers.
+    if '{' not in stripped:
+        return None
+    if stripped.startswith('{'):
+        try:
+            return json.loads(stripped)
+        except Exception:
+            pass
+    # Strip Markdown code fences if present. str.strip('`') was wrong
+    # here: it left the language tag ("json\n{...") in place and chewed
+    # backticks off the payload itself.
+    if stripped.startswith("```"):
+        m = _FENCE_RE.match(stripped)
+        if m:
+            stripped = m.group(1).strip()
+            try:
+                return json.loads(stripped)
+            except Exception:
+                pass
+    try:
+        start = stripped.find('{')
+        end = stripped.rfind('}')
+        if start != -1 and end != -1 and end > start:
+            return json.loads(stripped[start:end + 1])
+    except Exception:
+        return None
+    return None
+
+
+def _summarize_prices(prices):
+    """(low, median, high) without sorting; (None, None, None) when empty."""
+    if not prices:
+        return (None, None, None)
+    return (min(prices), statistics.median(prices), max(prices))
+
+
+def _now_ms():
+    """Current time as integer unix-epoch milliseconds (stored form)."""
+    return time.time_ns() // 1_000_000
+
+
+def _ts_to_iso(ts):
+    """Convert a stored epoch-ms timestamp to the ISO string the GUI expects.
+    Databases upgraded from the old schema keep TEXT affinity on their
+    timestamp columns, so epoch values written through them come back as
+    digit strings - treat those as numbers too. Anything else (legacy ISO
+    text) passes through unchanged."""
+    if isinstance(ts, str) and ts.isdigit():
+        ts = int(ts)
+    if isinstance(ts, (int, float)):
+        try:
+            return datetime.datetime.fromtimestamp(ts / 1000).isoformat()
+        except Exception:
+            return str(ts)
+    return ts
+
 
 class DB:
     # --- Internal helpers ---
@@ -16,61 +177,41 @@ class DB:
         - Accepts raw JSON string.
         - If embedded in prose or code fences, extracts the first {...} block.
         - Returns dict on success, else None.
+        String parsing is delegated to the memoized _coerce_json_str.
         """
         if not openai_result:
             return None
-        try:
-            if isinstance(openai_result, dict):
-                return openai_result
-            if isinstance(openai_result, str):
-                # Try direct parse
-                return json.loads(openai_result)
-        except Exception:
-            pass
-        # Try to extract JSON object from within text
+        if isinstance(openai_result, dict):
+            return openai_result
         if isinstance(openai_result, str):
-            s = openai_result.strip()
-            # Strip Markdown code fences if present
-            if s.startswith("```"):
-                try:
-                    s = s.strip('`')
-                except Exception:
-                    pass
-            try:
-                start = s.find('{')
-                end = s.rfind('}')
-                if start != -1 and end != -1 and end > start:
-                    maybe = s[start:end+1]
-                    return json.loads(maybe)
-            except Exception:
-                return None
+            return _coerce_json_str(openai_result)
         return None
     # --- Images helpers ---
     def add_image(self, item_id, image_path, annotation=None):
-        c = self.conn.cursor()
-        c.execute("INSERT INTO images (item_id, image_path, annotation) VALUES (?, ?, ?)", (item_id, image_path, annotation))
-        self.conn.commit()
+        with self._write_lock, self.conn:
+            self.conn.execute("INSERT INTO images (item_id, image_path, annotation) VALUES (?, ?, ?)", (item_id, image_path, annotation))
+        self._mark_dirty()
 
     def get_images(self, item_id):
-        c = self.conn.cursor()
-        c.execute("SELECT image_path FROM images WHERE item_id=?", (item_id,))
-        return [row[0] for row in c.fetchall()]
+        with self._read_conn() as conn:
+            c = conn.execute("SELECT image_path FROM images WHERE item_id=?", (item_id,))
+            return [row[0] for row in c.fetchall()]
 
     def get_image_annotations(self, item_id):
         """Return list of annotation texts for the item's images (empty strings filtered out)."""
         try:
-            c = self.conn.cursor()
-            c.execute("SELECT annotation FROM images WHERE item_id=?", (item_id,))
-            return [row[0] for row in c.fetchall() if row and row[0]]
+            with self._read_conn() as conn:
+                c = conn.execute("SELECT annotation FROM images WHERE item_id=?", (item_id,))
+                return [row[0] for row in c.fetchall() if row and row[0]]
         except Exception:
             return []
 
     def get_image_annotation(self, item_id: int, image_path: str) -> str:
         """Return annotation text for a specific image path, if present in images table; else ''."""
         try:
-            c = self.conn.cursor()
-            c.execute("SELECT annotation FROM images WHERE item_id=? AND image_path=? LIMIT 1", (item_id, image_path))
-            row = c.fetchone()
+            with self._read_conn() as conn:
+                c = conn.execute("SELECT annotation FROM images WHERE item_id=? AND image_path=? LIMIT 1", (item_id, image_path))
+                row = c.fetchone()
             if row and row[0]:
                 return row[0]
         except Exception:
@@ -83,17 +224,17 @@ class DB:
         Also records an image_history entry.
         """
         try:
-            c = self.conn.cursor()
-            c.execute(
-                "UPDATE images SET annotation=? WHERE item_id=? AND image_path=?",
-                (annotation, item_id, image_path),
-            )
-            if c.rowcount == 0:
-                c.execute(
-                    "INSERT INTO images (item_id, image_path, annotation) VALUES (?, ?, ?)",
-                    (item_id, image_path, annotation),
+            with self._write_lock, self.conn:
+                c = self.conn.execute(
+                    "UPDATE images SET annotation=? WHERE item_id=? AND image_path=?",
+                    (annotation, item_id, image_path),
                 )
-            self.conn.commit()
+                if c.rowcount == 0:
+                    self.conn.execute(
+                        "INSERT INTO images (item_id, image_path, annotation) VALUES (?, ?, ?)",
+                        (item_id, image_path, annotation),
+                    )
+            self._mark_dirty()
             try:
                 self.record_image_action(item_id, image_path, "annotate", annotation)
             except Exception:
@@ -106,20 +247,19 @@ class DB:
         Records image_history.
         """
         try:
-            c = self.conn.cursor()
-            # Try images table first
-            c.execute(
-                "UPDATE images SET image_path=? WHERE item_id=? AND image_path=?",
-                (new_path, item_id, old_path),
-            )
-            affected = c.rowcount
-            if affected == 0:
-                # Maybe it's the legacy primary path on items
-                c.execute(
-                    "UPDATE items SET image_path=? WHERE id=? AND image_path=?",
+            with self._write_lock, self.conn:
+                # Try images table first
+                c = self.conn.execute(
+                    "UPDATE images SET image_path=? WHERE item_id=? AND image_path=?",
                     (new_path, item_id, old_path),
                 )
-            self.conn.commit()
+                if c.rowcount == 0:
+                    # Maybe it's the legacy primary path on items
+                    self.conn.execute(
+                        "UPDATE items SET image_path=? WHERE id=? AND image_path=?",
+                        (new_path, item_id, old_path),
+                    )
+            self._mark_dirty()
             try:
                 self.record_image_action(item_id, new_path, "replace", f"from:{old_path}")
             except Exception:
@@ -132,13 +272,12 @@ class DB:
         Records image_history.
         """
         try:
-            c = self.conn.cursor()
-            c.execute("DELETE FROM images WHERE item_id=? AND image_path=?", (item_id, image_path))
-            affected = c.rowcount
-            if affected == 0:
-                # If legacy path matches, clear it
-                c.execute("UPDATE items SET image_path=NULL WHERE id=? AND image_path=?", (item_id, image_path))
-            self.conn.commit()
+            with self._write_lock, self.conn:
+                c = self.conn.execute("DELETE FROM images WHERE item_id=? AND image_path=?", (item_id, image_path))
+                if c.rowcount == 0:
+                    # If legacy path matches, clear it
+                    self.conn.execute("UPDATE items SET image_path=NULL WHERE id=? AND image_path=?", (item_id, image_path))
+            self._mark_dirty()
             try:
                 self.record_image_action(item_id, image_path, "delete", "")
             except Exception:
@@ -146,14 +285,142 @@ class DB:
         except Exception:
             pass
 
+    # Writers serialize at the WAL level anyway; a handful of pooled read
+    # connections is enough for the GUI plus background workers.
+    POOL_SIZE = 5
+
+    # Bump whenever a new startup migration lands. Once a database's
+    # PRAGMA user_version reaches this value the one-shot data migrations
+    # below are skipped entirely, so launch no longer pays their
+    # table_info probes and scans.
+    SCHEMA_VERSION = 1
+
     def __init__(self):
-        self.conn = sqlite3.connect(DB_PATH)
+        self.conn = _connect()
+        # Serializes multi-statement write transactions from different
+        # threads sharing this instance: sqlite3 only locks individual
+        # statements, so without this two threads could interleave inside
+        # each other's BEGIN/COMMIT window. Created before the migrations
+        # below since they take it too.
+        self._write_lock = threading.RLock()
         self.create_tables()
-        self._migrate_prices_to_columns()
-        self._migrate_drop_value_columns()
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self._migrate_timestamps_to_epoch()
+            self._migrate_price_column_to_real()
+            self._migrate_prices_to_columns()
+            self._migrate_drop_value_columns()
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        # Pool of read connections opened after migrations so every handle
+        # sees the final schema. WAL lets these read concurrently with the
+        # write connection above.
+        self._pool = queue.Queue()
+        for _ in range(self.POOL_SIZE):
+            self._pool.put(_connect(readonly=True))
+        # get_all_items memoization: any write through this instance bumps
+        # _version; writes from the GUI's other DB instances (each page
+        # opens its own) are caught by PRAGMA data_version, which changes
+        # whenever another connection modifies the file. The cache is only
+        # reused while both halves of the key still match.
+        self._version = 0
+        self._cache_lock = threading.Lock()
+        self._items_cache = None
+        self._items_cache_key = None
+        # get_analytics cache: (key, monotonic expiry, rendered text).
+        self._analytics_cache = None
+        # Audit writes (item_changes / image_history) are fire-and-forget,
+        # so they go through a queue drained by one background thread that
+        # groups a ~10ms burst into a single transaction. The UI thread
+        # pays a queue.put instead of a synchronous COMMIT.
+        self._audit_q = queue.Queue()
+        self._audit_thread = threading.Thread(target=self._audit_writer, daemon=True)
+        self._audit_thread.start()
+
+    def _audit_writer(self):
+        conn = _connect()
+        while True:
+            op = self._audit_q.get()
+            if op is None:
+                self._audit_q.task_done()
+                break
+            batch = [op]
+            deadline = time.monotonic() + 0.01
+            while time.monotonic() < deadline:
+                try:
+                    op = self._audit_q.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    batch.append(None)
+                    break
+                batch.append(op)
+            stop = batch and batch[-1] is None
+            if stop:
+                batch.pop()
+            try:
+                with conn:
+                    for sql, args in batch:
+                        conn.execute(sql, args)
+            except Exception:
+                pass
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._audit_q.task_done()
+            if stop:
+                break
+        conn.close()
+
+    def flush_audit(self):
+        """Block until every queued audit write has been committed."""
+        try:
+            self._audit_q.join()
+        except Exception:
+            pass
+
+    def _mark_dirty(self):
+        """Invalidate cached query results after any write, and checkpoint
+        the WAL every few hundred writes so it never grows to the point
+        where one unlucky commit eats a multi-second truncate."""
+        with self._cache_lock:
+            self._version += 1
+            version = self._version
+        if version % 500 == 0:
+            try:
+                self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except Exception:
+                pass
+
+    def close(self):
+        """Flush planner stats and the WAL, then close every connection."""
+        try:
+            self._audit_q.put(None)
+            self._audit_thread.join(timeout=5)
+        except Exception:
+            pass
+        try:
+            self.conn.execute("PRAGMA optimize")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception:
+            pass
+        try:
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+        except Exception:
+            pass
+        self.conn.close()
+
+    @contextmanager
+    def _read_conn(self):
+        """Check a read connection out of the pool for the duration of a query."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
 
     def create_tables(self):
         c = self.conn.cursor()
+        # One explicit transaction around all the DDL: the CREATE/ALTER
+        # idempotent guards would otherwise each autocommit (and fsync).
+        c.execute("BEGIN IMMEDIATE")
         # Items (no legacy 'value')
         c.execute(
             '''CREATE TABLE IF NOT EXISTS items (
@@ -161,7 +428,7 @@ class DB:
                 image_path TEXT,
                 notes TEXT,
                 openai_result TEXT,
-                created_at TEXT,
+                created_at INTEGER,
                 title TEXT,
                 brand TEXT,
                 maker TEXT,
@@ -184,12 +451,17 @@ class DB:
             ("prc_low", "REAL"),
             ("prc_med", "REAL"),
             ("prc_hi", "REAL"),
+            ("notes_len", "INTEGER"),
+            ("image_count", "INTEGER"),
+            ("price_count", "INTEGER"),
         ]
+        # Diff against the live schema instead of firing an ALTER per column
+        # and swallowing the "duplicate column" errors: one PRAGMA read,
+        # then only genuinely missing columns are added.
+        existing = {row[1] for row in c.execute('PRAGMA table_info(items)')}
         for col, col_type in additional_columns:
-            try:
+            if col not in existing:
                 c.execute(f'ALTER TABLE items ADD COLUMN {col} {col_type}')
-            except Exception:
-                pass
 
         # Other tables
         # Add annotation column to images table if missing
@@ -199,30 +471,28 @@ class DB:
                 item_id INTEGER,
                 image_path TEXT,
                 annotation TEXT,
-                FOREIGN KEY(item_id) REFERENCES items(id)
+                FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
             )'''
         )
-        # Try to add annotation column if it doesn't exist (idempotent)
-        try:
+        # Same schema-diff approach for the images annotation column
+        if 'annotation' not in {row[1] for row in c.execute('PRAGMA table_info(images)')}:
             c.execute('ALTER TABLE images ADD COLUMN annotation TEXT')
-        except Exception:
-            pass
         c.execute(
             '''CREATE TABLE IF NOT EXISTS revisions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 item_id INTEGER,
                 notes TEXT,
-                timestamp TEXT,
-                FOREIGN KEY(item_id) REFERENCES items(id)
+                timestamp INTEGER,
+                FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
             )'''
         )
         c.execute(
             '''CREATE TABLE IF NOT EXISTS prices (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 item_id INTEGER,
-                price TEXT,
-                timestamp TEXT,
-                FOREIGN KEY(item_id) REFERENCES items(id)
+                price REAL,
+                timestamp INTEGER,
+                FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
             )'''
         )
         c.execute(
@@ -232,8 +502,8 @@ class DB:
                 field TEXT,
                 old_value TEXT,
                 new_value TEXT,
-                timestamp TEXT,
-                FOREIGN KEY(item_id) REFERENCES items(id)
+                timestamp INTEGER,
+                FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
             )'''
         )
         c.execute(
@@ -243,10 +513,127 @@ class DB:
                 image_path TEXT,
                 action TEXT,
                 meta TEXT,
-                timestamp TEXT,
-                FOREIGN KEY(item_id) REFERENCES items(id)
+                timestamp INTEGER,
+                FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
             )'''
         )
+        # notes_len mirrors LENGTH(notes) so the analytics aggregate reads a
+        # compact int column instead of walking every notes blob. Triggers
+        # keep it current for any writer, including direct GUI updates.
+        c.execute(
+            '''CREATE TRIGGER IF NOT EXISTS trg_items_notes_len_ins
+               AFTER INSERT ON items BEGIN
+                   UPDATE items SET notes_len=LENGTH(NEW.notes) WHERE id=NEW.id;
+               END'''
+        )
+        c.execute(
+            '''CREATE TRIGGER IF NOT EXISTS trg_items_notes_len_upd
+               AFTER UPDATE OF notes ON items BEGIN
+                   UPDATE items SET notes_len=LENGTH(NEW.notes) WHERE id=NEW.id;
+               END'''
+        )
+        c.execute("UPDATE items SET notes_len=LENGTH(notes) WHERE notes_len IS NULL AND notes IS NOT NULL")
+        # Denormalized child counts so list views don't need a query per
+        # item. Triggers keep them current for every writer, including the
+        # dialogs that insert/delete image rows with raw SQL.
+        c.execute(
+            '''CREATE TRIGGER IF NOT EXISTS trg_images_count_ins
+               AFTER INSERT ON images BEGIN
+                   UPDATE items SET image_count=COALESCE(image_count,0)+1 WHERE id=NEW.item_id;
+               END'''
+        )
+        c.execute(
+            '''CREATE TRIGGER IF NOT EXISTS trg_images_count_del
+               AFTER DELETE ON images BEGIN
+                   UPDATE items SET image_count=MAX(COALESCE(image_count,1)-1, 0) WHERE id=OLD.item_id;
+               END'''
+        )
+        c.execute(
+            '''CREATE TRIGGER IF NOT EXISTS trg_prices_count_ins
+               AFTER INSERT ON prices BEGIN
+                   UPDATE items SET price_count=COALESCE(price_count,0)+1 WHERE id=NEW.item_id;
+               END'''
+        )
+        c.execute(
+            '''CREATE TRIGGER IF NOT EXISTS trg_prices_count_del
+               AFTER DELETE ON prices BEGIN
+                   UPDATE items SET price_count=MAX(COALESCE(price_count,1)-1, 0) WHERE id=OLD.item_id;
+               END'''
+        )
+        c.execute(
+            '''UPDATE items SET
+                   image_count=(SELECT COUNT(*) FROM images WHERE images.item_id=items.id),
+                   price_count=(SELECT COUNT(*) FROM prices WHERE prices.item_id=items.id)
+               WHERE image_count IS NULL OR price_count IS NULL'''
+        )
+        # Full-text search over the item text columns. External-content FTS5
+        # reuses the items rows for storage; triggers keep the index in sync
+        # for every writer, including direct GUI updates.
+        try:
+            # COUNT(*) on an external-content FTS table reads through to the
+            # content table, so it can't tell whether the index itself has
+            # been built - detect first creation via sqlite_master instead.
+            fts_is_new = not c.execute(
+                "SELECT 1 FROM sqlite_master WHERE name='items_fts'"
+            ).fetchone()
+            c.execute(
+                '''CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                    title, brand, maker, description, condition, provenance_notes, notes,
+                    content='items', content_rowid='id'
+                )'''
+            )
+            c.execute(
+                '''CREATE TRIGGER IF NOT EXISTS trg_items_fts_ins
+                   AFTER INSERT ON items BEGIN
+                       INSERT INTO items_fts(rowid, title, brand, maker, description, condition, provenance_notes, notes)
+                       VALUES (NEW.id, NEW.title, NEW.brand, NEW.maker, NEW.description, NEW.condition, NEW.provenance_notes, NEW.notes);
+                   END'''
+            )
+            c.execute(
+                '''CREATE TRIGGER IF NOT EXISTS trg_items_fts_del
+                   AFTER DELETE ON items BEGIN
+                       INSERT INTO items_fts(items_fts, rowid, title, brand, maker, description, condition, provenance_notes, notes)
+                       VALUES ('delete', OLD.id, OLD.title, OLD.brand, OLD.maker, OLD.description, OLD.condition, OLD.provenance_notes, OLD.notes);
+                   END'''
+            )
+            c.execute(
+                '''CREATE TRIGGER IF NOT EXISTS trg_items_fts_upd
+                   AFTER UPDATE OF title, brand, maker, description, condition, provenance_notes, notes ON items BEGIN
+                       INSERT INTO items_fts(items_fts, rowid, title, brand, maker, description, condition, provenance_notes, notes)
+                       VALUES ('delete', OLD.id, OLD.title, OLD.brand, OLD.maker, OLD.description, OLD.condition, OLD.provenance_notes, OLD.notes);
+                       INSERT INTO items_fts(rowid, title, brand, maker, description, condition, provenance_notes, notes)
+                       VALUES (NEW.id, NEW.title, NEW.brand, NEW.maker, NEW.description, NEW.condition, NEW.provenance_notes, NEW.notes);
+                   END'''
+            )
+            # Backfill once for databases that predate the FTS table
+            if fts_is_new:
+                c.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+            self._fts_ok = True
+        except Exception:
+            self._fts_ok = False
+        # Covering indexes: the per-item lookups below are served straight
+        # from the index B-tree without touching the row store.
+        wanted_indexes = {
+            'idx_rev_covering', 'idx_prices_item', 'idx_images_item',
+            'idx_changes_item', 'idx_imghist_item',
+        }
+        have_indexes = {
+            row[0] for row in c.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'"
+            )
+        }
+        c.execute('DROP INDEX IF EXISTS idx_rev_item_ts')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_rev_covering ON revisions(item_id, timestamp DESC, notes)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_prices_item ON prices(item_id, timestamp DESC, price)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_images_item ON images(item_id, image_path)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_changes_item ON item_changes(item_id, timestamp DESC)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_imghist_item ON image_history(item_id, timestamp DESC)')
+        # Seed sqlite_stat1 only when an index was actually just created:
+        # ANALYZE scans every index, far too much work to repeat on each of
+        # the GUI's DB() constructions. Day-to-day refreshes come from the
+        # PRAGMA optimize that close() issues.
+        if not wanted_indexes <= have_indexes:
+            c.execute('ANALYZE')
         self.conn.commit()
 
     def add_item(self, image_path, notes, openai_result):
@@ -255,58 +642,157 @@ class DB:
         prices = self.extract_prices(openai_result)
 
         # Compute low/med/high now
-        prc_low = prc_med = prc_hi = None
-        if prices:
-            prices.sort()
-            prc_low = prices[0]
-            prc_hi = prices[-1]
-            n = len(prices)
-            prc_med = prices[n // 2] if n % 2 == 1 else (prices[n // 2 - 1] + prices[n // 2]) / 2
+        prc_low, prc_med, prc_hi = _summarize_prices(prices)
 
-        c = self.conn.cursor()
-        c.execute(
-            '''
-            INSERT INTO items (
-                image_path, notes, openai_result, created_at,
-                title, brand, maker, description, condition, provenance_notes,
-                prc_low, prc_med, prc_hi
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''',
-            (
-                image_path, notes, openai_result, datetime.datetime.now().isoformat(),
+        # One transaction for the item, its first revision and its prices:
+        # a single commit (one fsync) instead of one per insert.
+        now = _now_ms()
+        with self._write_lock, self.conn:
+            c = self.conn.cursor()
+            params = (
+                image_path, notes, openai_result, now,
                 fields.get('title', ''), fields.get('brand', ''), fields.get('maker', ''), fields.get('description', ''),
                 fields.get('condition', ''), fields.get('provenance_notes', ''),
                 prc_low, prc_med, prc_hi,
-            ),
-        )
-        item_id = c.lastrowid
-        self.conn.commit()
-        self.add_revision(item_id, notes)
-        for price in prices:
-            self.add_price(item_id, price)
+            )
+            if _HAS_RETURNING:
+                item_id = c.execute(_SQL_ADD_ITEM_RETURNING, params).fetchone()[0]
+            else:
+                c.execute(_SQL_ADD_ITEM, params)
+                item_id = c.lastrowid
+            c.execute(
+                _SQL_ADD_REVISION,
+                (item_id, notes, now),
+            )
+            c.executemany(
+                _SQL_ADD_PRICE,
+                [(item_id, price, now) for price in prices],
+            )
+        self._mark_dirty()
         return item_id
 
+    # --- Bulk insert helpers ---
+    def add_items_many(self, rows):
+        """Insert many items in one transaction.
+        rows: iterable of (image_path, notes, openai_result) tuples.
+        Returns the list of new item ids. Much faster than looping add_item
+        for imports/backfills because everything commits once.
+        """
+        now = _now_ms()
+        item_ids = []
+        revision_rows = []
+        price_rows = []
+        with self._write_lock, self.conn:
+            c = self.conn.cursor()
+            for image_path, notes, openai_result in rows:
+                fields = self.extract_provenance_fields(openai_result)
+                prices = self.extract_prices(openai_result)
+                prc_low, prc_med, prc_hi = _summarize_prices(prices)
+                params = (
+                    image_path, notes, openai_result, now,
+                    fields.get('title', ''), fields.get('brand', ''), fields.get('maker', ''), fields.get('description', ''),
+                    fields.get('condition', ''), fields.get('provenance_notes', ''),
+                    prc_low, prc_med, prc_hi,
+                )
+                if _HAS_RETURNING:
+                    item_id = c.execute(_SQL_ADD_ITEM_RETURNING, params).fetchone()[0]
+                else:
+                    c.execute(_SQL_ADD_ITEM, params)
+                    item_id = c.lastrowid
+                item_ids.append(item_id)
+                revision_rows.append((item_id, notes, now))
+                price_rows.extend((item_id, p, now) for p in prices)
+            c.executemany(
+                _SQL_ADD_REVISION,
+                revision_rows,
+            )
+            c.executemany(
+                _SQL_ADD_PRICE,
+                price_rows,
+            )
+        self._mark_dirty()
+        return item_ids
+
+    def add_prices_many(self, pairs):
+        """Insert many (item_id, price) pairs in one transaction via executemany."""
+        now = _now_ms()
+        with self._write_lock, self.conn:
+            self.conn.executemany(
+                _SQL_ADD_PRICE,
+                [(item_id, price, now) for item_id, price in pairs],
+            )
+        self._mark_dirty()
+
     # --- Fetch helpers ---
-    def get_item(self, item_id):
-        c = self.conn.cursor()
-        c.execute(
-            '''
-            SELECT id, image_path, notes, openai_result, created_at,
+    def search_items(self, search_text):
+        """Return items (same shape as get_all_items, minus history) whose
+        text fields match search_text. Uses the FTS5 inverted index when
+        available; falls back to LIKE scans otherwise."""
+        search_text = (search_text or '').strip()
+        if not search_text:
+            return self.get_all_items()
+        base = '''
+            SELECT id, image_path, notes, created_at,
                    title, brand, maker, description, condition, provenance_notes,
                    prc_low, prc_med, prc_hi
-            FROM items WHERE id=?
-            ''',
-            (item_id,),
-        )
-        row = c.fetchone()
+            FROM items
+        '''
+        with self._read_conn() as conn:
+            rows = None
+            if getattr(self, '_fts_ok', False):
+                try:
+                    # Quote each term so user punctuation can't break the
+                    # MATCH syntax; implicit AND between terms.
+                    match = ' '.join('"%s"' % t.replace('"', '""') for t in search_text.split())
+                    rows = conn.execute(
+                        base + "WHERE id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?) ORDER BY id DESC",
+                        (match,),
+                    ).fetchall()
+                except Exception:
+                    rows = None
+            if rows is None:
+                like = f"%{search_text}%"
+                rows = conn.execute(
+                    base + '''WHERE title LIKE ? OR brand LIKE ? OR maker LIKE ?
+                              OR description LIKE ? OR condition LIKE ?
+                              OR provenance_notes LIKE ? OR notes LIKE ?
+                              ORDER BY id DESC''',
+                    (like,) * 7,
+                ).fetchall()
+        return [
+            {
+                'id': row[0],
+                'image_path': row[1],
+                'notes': row[2],
+                'created_at': _ts_to_iso(row[3]),
+                'title': row[4] or '',
+                'brand': row[5] or '',
+                'maker': row[6] or '',
+                'description': row[7] or '',
+                'condition': row[8] or '',
+                'provenance_notes': row[9] or '',
+                'prc_low': row[10],
+                'prc_med': row[11],
+                'prc_hi': row[12],
+            }
+            for row in rows
+        ]
+
+    def get_item(self, item_id):
+        with self._read_conn() as conn:
+            row = conn.execute(
+                '''
+                SELECT id, image_path, notes, openai_result, created_at,
+                       title, brand, maker, description, condition, provenance_notes,
+                       prc_low, prc_med, prc_hi
+                FROM items WHERE id=?
+                ''',
+                (item_id,),
+            ).fetchone()
         if not row:
             return None
-        keys = [
-            'id', 'image_path', 'notes', 'openai_result', 'created_at',
-            'title', 'brand', 'maker', 'description', 'condition', 'provenance_notes',
-            'prc_low', 'prc_med', 'prc_hi',
-        ]
-        item = dict(zip(keys, row))
+        item = dict(row)
+        item['created_at'] = _ts_to_iso(item['created_at'])
         item['images'] = self.get_images(item_id)
         item['history'] = self.get_revision_history(item_id)
         return item
@@ -318,29 +804,19 @@ class DB:
         # Try JSON first (with synonyms)
         data = self._coerce_json_obj(openai_result)
         if isinstance(data, dict):
-            # Map common synonyms to our schema
-            synonyms = {
-                'title': ['title', 'name', 'object_title', 'item_title'],
-                'brand': ['brand', 'brand_name'],
-                'maker': ['maker', 'manufacturer', 'artist', 'creator', 'author'],
-                'description': ['description', 'summary', 'details'],
-                'condition': ['condition', 'condition_notes', 'state'],
-                'provenance_notes': ['provenance_notes', 'provenance', 'history', 'notes_provenance'],
-            }
-            for key, keys in synonyms.items():
-                for k in keys:
-                    v = data.get(k)
-                    if isinstance(v, str) and v:
-                        fields[key] = v
-                        break
+            # Map common synonyms to our schema: walk the response keys once
+            # against the precomputed reverse lookup (first hit per field wins)
+            for k, v in data.items():
+                field = _SYNONYM_TO_FIELD.get(k)
+                if field and not fields[field] and isinstance(v, str) and v:
+                    fields[field] = v
             if any(fields.values()):
                 return fields
         # Fallback to regex parsing of labeled text
-        import re
         for line in openai_result.splitlines():
-            for k in fields:
-                pattern = re.compile(rf'^{k}[\s_]*:', re.IGNORECASE)
-                if pattern.match(line.strip()):
+            stripped = line.strip()
+            for k, pattern in _LABEL_RES.items():
+                if pattern.match(stripped):
                     fields[k] = line.split(':', 1)[-1].strip()
         if all(not v for v in fields.values()):
             fields['provenance_notes'] = openai_result.strip()
@@ -358,7 +834,6 @@ class DB:
         return ''
 
     def extract_prices(self, openai_result):
-        import re
         prices = []
         if not openai_result:
             return prices
@@ -373,7 +848,7 @@ class DB:
                     return float(x)
                 if isinstance(x, str):
                     try:
-                        m = re.search(r"([0-9][0-9,]*\.?[0-9]*)", x)
+                        m = _NUM_RE.search(x)
                         if m:
                             return float(m.group(1).replace(',', ''))
                     except Exception:
@@ -385,14 +860,13 @@ class DB:
                     prices.append(val)
             if prices:
                 return prices
-        # Fallback to $-amount regex
-        for line in openai_result.splitlines():
-            matches = re.findall(r'\$([0-9,.]+)', line)
-            for m in matches:
-                try:
-                    prices.append(float(m.replace(',', '')))
-                except Exception:
-                    pass
+        # Fallback to $-amount regex: one finditer over the whole text
+        # instead of splitting into lines and scanning each separately.
+        for m in _PRICE_RE.finditer(openai_result):
+            try:
+                prices.append(float(m.group(1).replace(',', '')))
+            except Exception:
+                pass
         return prices
 
     def get_price_range(self, item_id):
@@ -410,156 +884,333 @@ class DB:
         prices = [float(row[0]) for row in c.fetchall() if row[0] is not None]
         if not prices:
             return ('', '', '')
-        prices.sort()
-        n = len(prices)
-        low = prices[0]
-        high = prices[-1]
-        med = prices[n // 2] if n % 2 == 1 else (prices[n // 2 - 1] + prices[n // 2]) / 2
+        low, med, high = _summarize_prices(prices)
         try:
-            c.execute("UPDATE items SET prc_low=?, prc_med=?, prc_hi=? WHERE id=?", (low, med, high, item_id))
-            self.conn.commit()
+            with self._write_lock, self.conn:
+                self.conn.execute("UPDATE items SET prc_low=?, prc_med=?, prc_hi=? WHERE id=?", (low, med, high, item_id))
+            self._mark_dirty()
         except Exception:
             pass
         return (low, med, high)
 
     def add_revision(self, item_id, notes):
-        c = self.conn.cursor()
-        c.execute(
-            "INSERT INTO revisions (item_id, notes, timestamp) VALUES (?, ?, ?)",
-            (item_id, notes, datetime.datetime.now().isoformat()),
-        )
-        self.conn.commit()
+        with self._write_lock, self.conn:
+            self.conn.execute(_SQL_ADD_REVISION, (item_id, notes, _now_ms()))
+        self._mark_dirty()
 
     def add_price(self, item_id, price):
-        c = self.conn.cursor()
-        c.execute(
-            "INSERT INTO prices (item_id, price, timestamp) VALUES (?, ?, ?)",
-            (item_id, price, datetime.datetime.now().isoformat()),
-        )
-        self.conn.commit()
+        with self._write_lock, self.conn:
+            self.conn.execute(_SQL_ADD_PRICE, (item_id, price, _now_ms()))
+        self._mark_dirty()
 
     def update_item_analysis(self, item_id, new_openai_result):
         """Update an existing item with a new OpenAI result, refreshing fields and prices.
         Records changes and adds a revision. Safe to call repeatedly.
         """
         try:
-            # Get current item for change tracking
-            current = self.get_item(item_id) or {}
+            # Only the six diffable columns are needed for change tracking;
+            # get_item would also drag in openai_result, images and the full
+            # revision history just to throw them away.
+            with self._read_conn() as conn:
+                current = conn.execute(
+                    '''SELECT title, brand, maker, description, condition, provenance_notes
+                       FROM items WHERE id=?''',
+                    (item_id,),
+                ).fetchone()
             old_fields = {
-                'title': current.get('title', ''),
-                'brand': current.get('brand', ''),
-                'maker': current.get('maker', ''),
-                'description': current.get('description', ''),
-                'condition': current.get('condition', ''),
-                'provenance_notes': current.get('provenance_notes', ''),
+                'title': '', 'brand': '', 'maker': '',
+                'description': '', 'condition': '', 'provenance_notes': '',
             }
+            if current is not None:
+                old_fields.update({k: current[k] or '' for k in old_fields})
             # Extract values from new result
             fields = self.extract_provenance_fields(new_openai_result)
             prices = self.extract_prices(new_openai_result)
-            prc_low = prc_med = prc_hi = None
-            if prices:
-                prices.sort()
-                prc_low = prices[0]
-                prc_hi = prices[-1]
-                n = len(prices)
-                prc_med = prices[n // 2] if n % 2 == 1 else (prices[n // 2 - 1] + prices[n // 2]) / 2
-
-            # Update items row
-            c = self.conn.cursor()
-            c.execute(
-                '''UPDATE items SET
-                       openai_result=?,
-                       title=?, brand=?, maker=?, description=?, condition=?, provenance_notes=?,
-                       prc_low=?, prc_med=?, prc_hi=?
-                   WHERE id=?''',
-                (
-                    new_openai_result,
-                    fields.get('title', ''), fields.get('brand', ''), fields.get('maker', ''), fields.get('description', ''),
-                    fields.get('condition', ''), fields.get('provenance_notes', ''),
-                    prc_low, prc_med, prc_hi,
-                    item_id,
-                ),
-            )
-            self.conn.commit()
+            prc_low, prc_med, prc_hi = _summarize_prices(prices)
 
-            # Record field changes
-            for k, old_val in old_fields.items():
-                self.record_change(item_id, k, old_val, fields.get(k, ''))
-
-            # Add revision note
-            self.add_revision(item_id, "AI re-evaluation updated metadata.")
+            # Items row, revision note and prices land in one transaction
+            # (one commit) instead of one commit per statement.
+            now = _now_ms()
+            with self._write_lock, self.conn:
+                self.conn.execute(
+                    '''UPDATE items SET
+                           openai_result=?,
+                           title=?, brand=?, maker=?, description=?, condition=?, provenance_notes=?,
+                           prc_low=?, prc_med=?, prc_hi=?
+                       WHERE id=?''',
+                    (
+                        new_openai_result,
+                        fields.get('title', ''), fields.get('brand', ''), fields.get('maker', ''), fields.get('description', ''),
+                        fields.get('condition', ''), fields.get('provenance_notes', ''),
+                        prc_low, prc_med, prc_hi,
+                        item_id,
+                    ),
+                )
+                self.conn.execute(
+                    _SQL_ADD_REVISION,
+                    (item_id, "AI re-evaluation updated metadata.", now),
+                )
+                self.conn.executemany(
+                    _SQL_ADD_PRICE,
+                    [(item_id, p, now) for p in prices],
+                )
+            self._mark_dirty()
 
-            # Store individual prices
-            for p in prices:
-                try:
-                    self.add_price(item_id, p)
-                except Exception:
-                    pass
+            # Record field changes as one batch (queued to the audit writer)
+            self.record_changes(
+                item_id,
+                [(k, old_val, fields.get(k, '')) for k, old_val in old_fields.items()],
+            )
         except Exception:
             # Best-effort update; ignore failures to keep UI responsive
             pass
 
-    def get_all_items(self):
-        c = self.conn.cursor()
-        c.execute(
-            '''
-            SELECT id, image_path, notes, created_at,
-                   title, brand, maker, description, condition, provenance_notes,
-                   prc_low, prc_med, prc_hi
-            FROM items
-            ORDER BY id DESC
-            '''
-        )
-        items = []
-        for row in c.fetchall():
-            item_id = row[0]
-            history = self.get_revision_history(item_id)
-            items.append(
-                {
-                    'id': item_id,
-                    'image_path': row[1],
-                    'notes': row[2],
-                    'created_at': row[3],
-                    'title': row[4] or '',
-                    'brand': row[5] or '',
-                    'maker': row[6] or '',
-                    'description': row[7] or '',
-                    'condition': row[8] or '',
-                    'provenance_notes': row[9] or '',
-                    'prc_low': row[10],
-                    'prc_med': row[11],
-                    'prc_hi': row[12],
-                    'history': history,
-                }
+    def _cache_key(self):
+        """(local write version, data_version) pair identifying database
+        state. data_version is per-connection and moves only when some
+        *other* connection writes - exactly the cross-instance case the
+        local counter can't see - so together they cover both."""
+        try:
+            dv = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        except Exception:
+            dv = -1
+        return (self._version, dv)
+
+    def get_all_items(self, limit=None, before_id=None):
+        """Return items newest-first. With no arguments this is the full
+        (memoized) catalog; pass limit and optionally before_id - the
+        smallest id of the previous page - for keyset pagination, which
+        seeks straight to the page instead of walking and discarding
+        OFFSET rows."""
+        paged = limit is not None or before_id is not None
+        # Serve repeated GUI refreshes from the memoized list when nothing
+        # has been written since it was built. Callers treat the result as
+        # read-only snapshot data. Pages are cheap enough to skip the cache.
+        if not paged:
+            with self._cache_lock:
+                key = self._cache_key()
+                if self._items_cache is not None and self._items_cache_key == key:
+                    return self._items_cache
+        # Single LEFT JOIN instead of one revisions query per item (N+1):
+        # revision rows arrive interleaved with their item and are grouped
+        # in one pass in Python. The page is selected on items alone (id is
+        # the PK, so the keyset seek is an index range) before the join so
+        # LIMIT counts items, not joined revision rows.
+        params = []
+        source = 'items'
+        if paged:
+            source = '(SELECT * FROM items'
+            if before_id is not None:
+                source += ' WHERE id < ?'
+                params.append(before_id)
+            source += ' ORDER BY id DESC'
+            if limit is not None:
+                source += ' LIMIT ?'
+                params.append(limit)
+            source += ')'
+        with self._read_conn() as conn:
+            c = conn.execute(
+                f'''
+                SELECT i.id, i.image_path, i.notes, i.created_at,
+                       i.title, i.brand, i.maker, i.description, i.condition, i.provenance_notes,
+                       i.prc_low, i.prc_med, i.prc_hi,
+                       i.image_count, i.price_count,
+                       r.notes, r.timestamp
+                FROM {source} i
+                LEFT JOIN revisions r ON r.item_id = i.id
+                ORDER BY i.id DESC, r.timestamp DESC
+                ''',
+                params,
             )
+            # Stream in fixed-size chunks instead of fetchall(): the join
+            # can emit far more rows than there are items, and fetchmany
+            # keeps only one chunk of them alive while amortizing the
+            # per-fetch overhead across the batch.
+            c.arraysize = 1024
+            items = []
+            last_id = None
+            while True:
+                chunk = c.fetchmany()
+                if not chunk:
+                    break
+                for row in chunk:
+                    item_id = row[0]
+                    if item_id != last_id:
+                        last_id = item_id
+                        items.append(
+                            {
+                                'id': item_id,
+                                'image_path': row[1],
+                                'notes': row[2],
+                                'created_at': _ts_to_iso(row[3]),
+                                'title': row[4] or '',
+                                'brand': row[5] or '',
+                                'maker': row[6] or '',
+                                'description': row[7] or '',
+                                'condition': row[8] or '',
+                                'provenance_notes': row[9] or '',
+                                'prc_low': row[10],
+                                'prc_med': row[11],
+                                'prc_hi': row[12],
+                                'image_count': row[13] or 0,
+                                'price_count': row[14] or 0,
+                                'history': [],
+                            }
+                        )
+                    if row[16] is not None:
+                        items[-1]['history'].append((row[15], _ts_to_iso(row[16])))
+        if not paged:
+            with self._cache_lock:
+                self._items_cache = items
+                self._items_cache_key = key
         return items
 
     # --- Migration helpers ---
-    def _migrate_prices_to_columns(self):
-        """Backfill prc_low/med/hi columns for existing rows if empty."""
+    def _migrate_timestamps_to_epoch(self):
+        """Rewrite legacy ISO TEXT timestamps as epoch milliseconds.
+        Parsing happens in Python because the old strings came from
+        datetime.now().isoformat() - local time - and SQLite's
+        strftime('%s', ...) would read them as UTC, shifting every
+        migrated timestamp by the machine's UTC offset. Digit strings
+        (epoch values already stored through a TEXT-affinity column) are
+        left alone; _ts_to_iso handles them at read time."""
         try:
-            c = self.conn.cursor()
-            c.execute("SELECT id, prc_low, prc_med, prc_hi FROM items")
-            rows = c.fetchall()
-            for item_id, lo, me, hi in rows:
-                if lo is None and me is None and hi is None:
-                    low, med, high = self.get_price_range(item_id)
-                    if any((low, med, high)):
+            with self._write_lock, self.conn:
+                for table, col in (
+                    ('items', 'created_at'),
+                    ('revisions', 'timestamp'),
+                    ('prices', 'timestamp'),
+                    ('item_changes', 'timestamp'),
+                    ('image_history', 'timestamp'),
+                ):
+                    rows = self.conn.execute(
+                        f"SELECT rowid, {col} FROM {table} "
+                        f"WHERE typeof({col})='text' AND {col} GLOB '*[^0-9]*'"
+                    ).fetchall()
+                    updates = []
+                    for rowid, value in rows:
                         try:
-                            c.execute("UPDATE items SET prc_low=?, prc_med=?, prc_hi=? WHERE id=?", (low, med, high, item_id))
+                            dt = datetime.datetime.fromisoformat(value)
+                            updates.append((int(dt.timestamp() * 1000), rowid))
                         except Exception:
                             pass
+                    if updates:
+                        self.conn.executemany(
+                            f"UPDATE {table} SET {col}=? WHERE rowid=?", updates
+                        )
+        except Exception:
+            pass
+
+    def _migrate_price_column_to_real(self):
+        """Rebuild the prices table with a REAL price column if it was
+        declared TEXT, so aggregates run on numbers instead of casting
+        every row."""
+        try:
+            c = self.conn.cursor()
+            c.execute("PRAGMA table_info(prices)")
+            decl = {r[1]: (r[2] or '').upper() for r in c.fetchall()}
+            if decl.get('price') in (None, 'REAL'):
+                return
+            c.execute("PRAGMA foreign_keys=OFF")
+            c.execute(
+                '''CREATE TABLE IF NOT EXISTS prices_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    item_id INTEGER,
+                    price REAL,
+                    timestamp INTEGER,
+                    FOREIGN KEY(item_id) REFERENCES items(id) ON DELETE CASCADE
+                )'''
+            )
+            c.execute(
+                '''INSERT INTO prices_new (id, item_id, price, timestamp)
+                   SELECT id, item_id, CAST(price AS REAL), timestamp FROM prices'''
+            )
+            c.execute('DROP TABLE prices')
+            c.execute('ALTER TABLE prices_new RENAME TO prices')
+            # DROP TABLE took the price_count triggers and the covering
+            # index with it; recreate them now (same DDL as create_tables)
+            # so counts stay correct during this first post-migration
+            # session instead of only after the next launch.
+            c.execute(
+                '''CREATE TRIGGER IF NOT EXISTS trg_prices_count_ins
+                   AFTER INSERT ON prices BEGIN
+                       UPDATE items SET price_count=COALESCE(price_count,0)+1 WHERE id=NEW.item_id;
+                   END'''
+            )
+            c.execute(
+                '''CREATE TRIGGER IF NOT EXISTS trg_prices_count_del
+                   AFTER DELETE ON prices BEGIN
+                       UPDATE items SET price_count=MAX(COALESCE(price_count,1)-1, 0) WHERE id=OLD.item_id;
+                   END'''
+            )
+            c.execute('CREATE INDEX IF NOT EXISTS idx_prices_item ON prices(item_id, timestamp DESC, price)')
+            # Recount unconditionally: the startup backfill only repairs
+            # NULL counts and has already run by this point.
+            c.execute(
+                '''UPDATE items SET
+                       price_count=(SELECT COUNT(*) FROM prices WHERE prices.item_id=items.id)'''
+            )
             self.conn.commit()
         except Exception:
             pass
+        finally:
+            try:
+                c.execute("PRAGMA foreign_keys=ON")
+            except Exception:
+                pass
+
+    def _migrate_prices_to_columns(self):
+        """Backfill prc_low/med/hi columns for existing rows if empty.
+        One JOIN gathers every unbackfilled item's prices, the summaries are
+        computed in Python (SQLite has no median), and a single executemany
+        writes them back in one transaction - instead of two statements per
+        item."""
+        try:
+            c = self.conn.cursor()
+            c.execute(
+                '''SELECT p.item_id, p.price FROM prices p
+                   JOIN items i ON i.id = p.item_id
+                   WHERE i.prc_low IS NULL AND i.prc_med IS NULL AND i.prc_hi IS NULL
+                   ORDER BY p.item_id'''
+            )
+            by_item = {}
+            c.arraysize = 1024
+            while True:
+                chunk = c.fetchmany()
+                if not chunk:
+                    break
+                for item_id, price in chunk:
+                    if price is not None:
+                        by_item.setdefault(item_id, []).append(float(price))
+            if not by_item:
+                return
+            updates = []
+            for item_id, prices in by_item.items():
+                low, med, high = _summarize_prices(prices)
+                if any((low, med, high)):
+                    updates.append((low, med, high, item_id))
+            if updates:
+                with self._write_lock, self.conn:
+                    self.conn.executemany(
+                        "UPDATE items SET prc_low=?, prc_med=?, prc_hi=? WHERE id=?",
+                        updates,
+                    )
+        except Exception:
+            pass
 
     def get_revision_history(self, item_id):
-        c = self.conn.cursor()
-        c.execute(
-            "SELECT notes, timestamp FROM revisions WHERE item_id=? ORDER BY timestamp DESC",
-            (item_id,),
-        )
-        return c.fetchall()
+        # Stream in fetchmany batches (arraysize lets the C layer fill a
+        # whole batch per call) instead of materializing deep histories in
+        # one giant fetchall allocation. Still returns a list for the GUI.
+        with self._read_conn() as conn:
+            c = conn.execute(_SQL_GET_REVISIONS, (item_id,))
+            c.arraysize = 1000
+            history = []
+            while True:
+                batch = c.fetchmany()
+                if not batch:
+                    return history
+                history.extend((notes, _ts_to_iso(ts)) for notes, ts in batch)
 
     # --- Schema migration: drop deprecated 'value' columns ---
     def _migrate_drop_value_columns(self):
@@ -573,6 +1224,15 @@ class DB:
 
             c.execute("PRAGMA foreign_keys=OFF")
 
+            # SQLite >= 3.35 drops the column in place - an O(1) schema
+            # edit instead of copying every row through a *_new table.
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                for table in ('items', 'revisions'):
+                    if has_col(table, 'value'):
+                        c.execute(f"ALTER TABLE {table} DROP COLUMN value")
+                self.conn.commit()
+                return
+
             if has_col('items', 'value'):
                 c.execute(
                     '''CREATE TABLE IF NOT EXISTS items_new (
@@ -636,39 +1296,88 @@ class DB:
     def record_change(self, item_id, field, old_value, new_value):
         if (old_value or '') == (new_value or ''):
             return
-        c = self.conn.cursor()
-        c.execute(
-            "INSERT INTO item_changes (item_id, field, old_value, new_value, timestamp) VALUES (?, ?, ?, ?, ?)",
+        self.record_changes(item_id, [(field, old_value, new_value)])
+
+    def record_changes(self, item_id, changes):
+        """Record many (field, old_value, new_value) changes for one item.
+        Unchanged pairs are dropped, all rows share one timestamp, and the
+        batch is queued together so the audit writer lands it in a single
+        transaction."""
+        now = _now_ms()
+        rows = [
             (
                 item_id,
                 field,
                 str(old_value) if old_value is not None else '',
                 str(new_value) if new_value is not None else '',
-                datetime.datetime.now().isoformat(),
-            ),
-        )
-        self.conn.commit()
+                now,
+            )
+            for field, old_value, new_value in changes
+            if (old_value or '') != (new_value or '')
+        ]
+        if not rows:
+            return
+        for row in rows:
+            self._audit_q.put((_SQL_ADD_CHANGE, row))
+        self._mark_dirty()
 
     def record_image_action(self, item_id, image_path, action, meta=""):
-        c = self.conn.cursor()
-        c.execute(
-            "INSERT INTO image_history (item_id, image_path, action, meta, timestamp) VALUES (?, ?, ?, ?, ?)",
-            (item_id, image_path, action, meta or '', datetime.datetime.now().isoformat()),
-        )
-        self.conn.commit()
+        self._audit_q.put((
+            _SQL_ADD_IMG_HISTORY,
+            (item_id, image_path, action, meta or '', _now_ms()),
+        ))
+        self._mark_dirty()
 
     def get_item_changes(self, item_id):
-        c = self.conn.cursor()
-        c.execute(
-            "SELECT field, old_value, new_value, timestamp FROM item_changes WHERE item_id=? ORDER BY timestamp DESC",
-            (item_id,),
-        )
-        return c.fetchall()
+        self.flush_audit()
+        with self._read_conn() as conn:
+            c = conn.execute(_SQL_GET_CHANGES, (item_id,))
+            return [(f, o, n, _ts_to_iso(ts)) for f, o, n, ts in c.fetchall()]
+
+    def get_image_history(self, item_id):
+        self.flush_audit()
+        with self._read_conn() as conn:
+            c = conn.execute(_SQL_GET_IMG_HISTORY, (item_id,))
+            return [(p, a, m, _ts_to_iso(ts)) for p, a, m, ts in c.fetchall()]
+
+    # Analytics tolerate slight staleness, so cached text is reused for up
+    # to a minute even if the version counter can't prove nothing changed
+    # (e.g. writes through raw conn access from the GUI dialogs).
+    ANALYTICS_TTL = 60.0
 
     def get_analytics(self):
-        c = self.conn.cursor()
-        c.execute("SELECT COUNT(*), AVG(LENGTH(notes)) FROM items")
-        count, avg_notes = c.fetchone()
-        c.execute("SELECT AVG(CAST(price AS FLOAT)) FROM prices")
-        avg_price = c.fetchone()[0]
-        return f"Total items: {count}\nAvg notes length: {avg_notes}\nAvg price: {avg_price}"
+        with self._cache_lock:
+            key = self._cache_key()
+            cached = self._analytics_cache
+            if cached is not None:
+                cached_key, expiry, text = cached
+                if cached_key == key and time.monotonic() < expiry:
+                    return text
+        # One statement, one round trip: every aggregate the analytics page
+        # shows runs as a scalar subquery of a single VDBE program instead
+        # of a separate execute per number.
+        with self._read_conn() as conn:
+            (count, avg_notes, avg_price,
+             n_images, n_prices, n_revisions, n_titled) = conn.execute(
+                '''
+                SELECT (SELECT COUNT(*) FROM items),
+                       (SELECT AVG(notes_len) FROM items),
+                       (SELECT AVG(price) FROM prices),
+                       (SELECT COUNT(*) FROM images),
+                       (SELECT COUNT(*) FROM prices),
+                       (SELECT COUNT(*) FROM revisions),
+                       (SELECT COUNT(*) FROM items WHERE title IS NOT NULL AND title <> '')
+                '''
+            ).fetchone()
+        text = (
+            f"Total items: {count}\n"
+            f"Avg notes length: {avg_notes}\n"
+            f"Avg price: {avg_price}\n"
+            f"Items with title: {n_titled}\n"
+            f"Total images: {n_images}\n"
+            f"Total price entries: {n_prices}\n"
+            f"Total revisions: {n_revisions}"
+        )
+        with self._cache_lock:
+            self._analytics_cache = (key, time.monotonic() + self.ANALYTICS_TTL, text)
+        return text
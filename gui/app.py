@@ -307,6 +307,14 @@ class ProvenanceApp(QApplication):
             self.settings.setValue("last_tab_index", self.tabs.currentIndex())
         except Exception:
             pass
+        # Close page DB handles so the WAL is checkpointed and planner stats saved
+        for page in (getattr(self, name, None) for name in
+                     ("upload_page", "catalog_page", "dashboard_page", "analytics_page")):
+            try:
+                if page is not None and hasattr(page, "db"):
+                    page.db.close()
+            except Exception:
+                pass
         event.accept()
 
     # Navigation is now handled by tabs
@@ -11,6 +11,8 @@ import sys
 import datetime
 import subprocess
 import json
+import time
+import numpy as np
 import psutil
 REQUIRED_PACKAGES = [
     'PyQt5',
@@ -191,14 +193,11 @@ class DashboardPage(QWidget):
     # Removed _status_gauge and server widgets
 
     def init_timers(self):
-        import numpy as np
-        import psutil
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_dashboard)
         self.timer.start(2000)
 
     def update_dashboard(self):
-        import numpy as np, psutil, time
         # Timeline: show revision history count over time
         revisions = []
         for item in self.db.get_all_items():
@@ -393,7 +392,9 @@ class DashboardPage(QWidget):
             path, _ = QFileDialog.getSaveFileName(self, "Export Catalog", "catalog_export.json", "JSON Files (*.json)")
             if not path:
                 return
-            items = self.db.get_all_items() or []
+            # Copy before enriching: get_all_items returns the shared
+            # memoized list, which callers must treat as read-only
+            items = [dict(it) for it in (self.db.get_all_items() or [])]
             # Enrich with images array
             for it in items:
                 try:
@@ -154,12 +154,7 @@ class EditItemDialog(QDialog):
         )
         # Image history if table exists
         try:
-            c = self.db.conn.cursor()
-            c.execute(
-                "SELECT image_path, action, meta, timestamp FROM image_history WHERE item_id=? ORDER BY timestamp DESC",
-                (self.item_id,),
-            )
-            rows = c.fetchall()
+            rows = self.db.get_image_history(self.item_id)
         except Exception:
             rows = []
         self.image_history_view.setPlainText(